@@ -1,16 +1,32 @@
 import os
-import json
+import hashlib
 import logging
 import math
-from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
-
-from flask import Flask, request, redirect, url_for, session, render_template, flash, Response
-from jinja2 import DictLoader
+import re
+import zlib
+import gzip
+import mimetypes
+import itertools
+import threading
+import time
+import datetime
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse, parse_qs, urlencode, urlunparse, quote
+from urllib.request import urlretrieve, urlopen, Request
+from types import SimpleNamespace
+
+from flask import Flask, request, redirect, url_for, session, render_template, stream_template, flash, get_flashed_messages, Response, stream_with_context, g, send_from_directory
+from jinja2 import DictLoader, ModuleLoader, FileSystemBytecodeCache
+from markupsafe import Markup, escape
 from bson import json_util, ObjectId
+import orjson
 
 # Database Drivers
 from pymongo import MongoClient, ASCENDING, DESCENDING
-from sqlalchemy import create_engine, inspect, text
+from sqlalchemy import Engine, create_engine, inspect, text, MetaData, Table, bindparam, select, func, cast, literal_column
+from sqlalchemy import Date, DateTime, Time, LargeBinary, BINARY, VARBINARY, Text, CHAR, String
 import redis
 
 # ==========================================
@@ -18,49 +34,162 @@ import redis
 # ==========================================
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', 'links4u_rich_apis_secret')
-app.jinja_env.globals.update(max=max, min=min, str=str, type=type, len=len, list=list, int=int)
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s: %(message)s')
 ROWS_PER_PAGE = 25
+VENDOR_DIR = os.path.join(app.root_path, 'static', 'vendor')
+# Front-end assets served locally once fetched with `flask --app app vendor-assets` (done in the Docker build).
+# The Docker build also compiles static/vendor/styles.css with the Tailwind CLI; tailwind.js is only the dev fallback.
+VENDOR_ASSETS = {
+    'tailwind.js': 'https://cdn.tailwindcss.com/3.3.5',
+    'alpine.min.js': 'https://cdn.jsdelivr.net/npm/alpinejs@3.13.3/dist/cdn.min.js',
+    'codemirror.min.css': 'https://cdnjs.cloudflare.com/ajax/libs/codemirror/5.65.5/codemirror.min.css',
+    'neo.min.css': 'https://cdnjs.cloudflare.com/ajax/libs/codemirror/5.65.5/theme/neo.min.css',
+    'codemirror.min.js': 'https://cdnjs.cloudflare.com/ajax/libs/codemirror/5.65.5/codemirror.min.js',
+    'javascript.min.js': 'https://cdnjs.cloudflare.com/ajax/libs/codemirror/5.65.5/mode/javascript/javascript.min.js',
+    'htmx.min.js': 'https://unpkg.com/htmx.org@1.9.10/dist/htmx.min.js',
+}
+FONTS_CSS_URL = 'https://fonts.googleapis.com/css2?family=DM+Sans:wght@400;500;700&family=Playfair+Display:wght@700&display=swap'
+# Vendored files concatenated into one download per page; a bundle is only built when all its parts are present
+ASSET_BUNDLES = {
+    'bundle.css': ('fonts.css', 'styles.css'),
+    'bundle.js': ('alpine.min.js', 'htmx.min.js'),
+    'editor.css': ('codemirror.min.css', 'neo.min.css'),
+    'editor.js': ('codemirror.min.js', 'javascript.min.js'),
+}
+SCHEMA_CACHE_TTL = 30  # seconds cached table listings, reflections and primary keys stay fresh
+DB_LIST_CACHE_TTL = 30  # seconds the sidebar database list is reused before asking the server again
+COUNT_CACHE_TTL = 30  # seconds an unfiltered table total is reused
+EXACT_COUNT_LIMIT = 100_000  # below this catalog estimate, Postgres/MySQL totals are counted exactly
+PREVIEW_FIELDS = 10  # wider documents/rows are projected to this many top-level fields in the rows table
+PREVIEW_CHARS = 200  # characters of a row shown in the Data Preview column
+ROWS_CACHE_TTL = 10  # seconds a rendered listing page's rows are reused (stale for at most this long, or WARM_ROWS_TTL for a prewarmed page, on other workers without REDIS_URL)
+ROWS_CACHE_SIZE = 512  # listing pages kept per process, least recently used evicted first
+SQL_POOL_SIZE = int(os.environ.get('SQL_POOL_SIZE', 5))  # pooled connections kept per engine in each worker
+SQL_MAX_OVERFLOW = int(os.environ.get('SQL_MAX_OVERFLOW', 10))  # extra connections allowed under bursts
+MAX_CLIENTS = int(os.environ.get('MAX_CLIENTS', 16))  # engines/clients (with their pools) kept per worker, least recently used closed first
+WARM_TABLES = 8  # first pages of this many tables are fetched in the background when a database is opened
+WARM_ROWS_TTL = 60  # seconds a prewarmed first page stays servable, long enough to outlive the click it anticipates
+WARM_QUEUE_LIMIT = 32  # prewarm jobs queued or running per process; further ones are dropped, not queued
+REDIS_SCAN_COUNT = 1000  # keys Redis examines per SCAN round trip
+REDIS_SORT_LIMIT = 10_000  # keyspaces up to this size are listed in key order; larger ones page in SCAN order
 
 # ==========================================
 # ADAPTERS
 # ==========================================
+# Engines and clients carry their own connection pools, so one per URI is shared by the whole process.
+# Kept in LRU order and capped at MAX_CLIENTS so a database browsed once doesn't hold its pool forever
+_CLIENTS = OrderedDict()
+_CLIENTS_LOCK = threading.RLock()
+
+# Optional cross-worker cache (REDIS_URL): a cold gunicorn worker picks up table lists and totals
+# another worker already fetched. Short socket timeouts, and any Redis error just means a miss
+SHARED_CACHE = redis.Redis.from_url(os.environ['REDIS_URL'], socket_timeout=0.5, socket_connect_timeout=0.5) if os.environ.get('REDIS_URL') else None
+
+def ttl_cached(store, key, ttl, compute, shared=None):
+    """Memoizes compute() in store[key] for ttl seconds; with a shared key, also in SHARED_CACHE as JSON."""
+    hit = store.get(key)
+    if hit and time.monotonic() - hit[0] < ttl: return hit[1]
+    blob = None
+    if shared and SHARED_CACHE is not None:
+        try: blob = SHARED_CACHE.get(shared)
+        except redis.RedisError: pass
+    if blob is not None: value = orjson.loads(blob)
+    else:
+        value = compute()
+        if shared and SHARED_CACHE is not None:
+            try: SHARED_CACHE.set(shared, orjson.dumps(value), ex=ttl)
+            except redis.RedisError: pass
+    store[key] = (time.monotonic(), value)
+    return value
+
+def forget_shared(*keys):
+    if SHARED_CACHE is None: return
+    try: SHARED_CACHE.unlink(*keys)
+    except redis.RedisError: pass
+
+def uri_digest(uri): return hashlib.blake2b(uri.encode(), digest_size=16).hexdigest()
+
+def shared_client(kind, uri, factory):
+    """Returns the process-wide client for uri, building and probing it only on first use."""
+    key = (kind, uri_digest(uri))
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(key)
+        if client is not None:
+            _CLIENTS.move_to_end(key)
+            return client
+        client = _CLIENTS[key] = factory()
+        stale = [_CLIENTS.popitem(last=False)[1] for _ in range(len(_CLIENTS) - MAX_CLIENTS)]
+    # Evicted clients are only let go, not closed: in-flight requests, streamed pages and warm jobs may still
+    # hold them, and the pool is closed once the last of those drops its reference
+    for old in stale: release_client(old, close=False)
+    return client
+
+def release_client(client, close=True):
+    """Forgets a shared engine/client, its schema cache and every cached adapter built on it; closes it with close."""
+    with _CLIENTS_LOCK:
+        for key in [k for k, c in _CLIENTS.items() if c is client]: del _CLIENTS[key]
+        for key in [k for k, a in _ADAPTER_CACHE.items() if a.pool() is client]: del _ADAPTER_CACHE[key]
+    if isinstance(client, Engine): _SCHEMA_CACHE.pop(client.url.render_as_string(hide_password=False), None)
+    if not close: return
+    if isinstance(client, Engine): client.dispose()
+    else: client.close()
+
 class DatabaseAdapter:
     def connect(self, uri, db_name=None): raise NotImplementedError
     def list_databases(self): raise NotImplementedError
     def drop_database(self, db_name): raise NotImplementedError
     def list_tables(self, db_name): raise NotImplementedError
     def drop_table(self, db_name, table): raise NotImplementedError
-    def get_rows(self, db_name, table, page, search=None, sort_col=None, sort_dir='desc'): raise NotImplementedError
+    def get_rows(self, db_name, table, page, search=None, sort_col=None, sort_dir='desc', after=None, fields=None): raise NotImplementedError
+    def iter_rows(self, db_name, table, page, search=None, sort_col=None, sort_dir='desc', after=None, fields=None): raise NotImplementedError
     def get_row(self, db_name, table, id): raise NotImplementedError
     def save_row(self, db_name, table, id, data, is_new): raise NotImplementedError
     def delete_row(self, db_name, table, id): raise NotImplementedError
+    # Inserts a list of new rows; adapters with a bulk write path override this
+    def add_rows(self, db_name, table, rows):
+        for row in rows: self.save_row(db_name, table, 'new', row, is_new=True)
+    # The shared engine/client this adapter runs on
+    def pool(self): return None
+    # Whether get_rows can continue from the last row's id (`after`) under this sort instead of skipping
+    def supports_after(self, sort_col): return False
+    # Top-level fields worth fetching for the rows table, or None for whole rows
+    def preview_fields(self, db_name, table): return None
 
 class MongoAdapter(DatabaseAdapter):
-    def __init__(self): self.client = None
+    def __init__(self):
+        self.client = None
+        self._counts = {}
+        self._previews = {}
+        self._id_types = {}
     
     def connect(self, uri, db_name=None):
-        self.client = MongoClient(uri, serverSelectionTimeoutMS=5000)
-        self.client.server_info()
+        self.client = shared_client('mongo', uri, lambda: self._new_client(uri))
         return True
 
+    @staticmethod
+    def _new_client(uri):
+        # Wire compression is negotiated once at handshake; zstd when the server has it, zlib otherwise
+        client = MongoClient(uri, serverSelectionTimeoutMS=5000, maxPoolSize=50, minPoolSize=5,
+                             compressors='zstd,zlib', retryReads=True, appname='DB_Compass')
+        client.server_info()
+        return client
+
     def list_databases(self): return sorted(self.client.list_database_names())
+    def pool(self): return self.client
     def drop_database(self, db_name): self.client.drop_database(db_name)
     def list_tables(self, db_name): return sorted(self.client[db_name].list_collection_names())
     def drop_table(self, db_name, table): self.client[db_name].drop_collection(table)
 
-    def get_rows(self, db_name, table, page, search=None, sort_col=None, sort_dir='desc'):
-        col = self.client[db_name][table]
+    def _query(self, search):
         query = {}
         
         # Deep Search Logic for Mongo
         if search:
             search = search.strip()
             # 1. Try ObjectId match
-            try: 
-                query = {'_id': ObjectId(search)}
-            except:
+            if ObjectId.is_valid(search): query = {'_id': ObjectId(search)}
+            else:
                 # 2. Try Regex on specific string fields (expensive but necessary for deep search)
                 # Note: Scanning all fields with regex is very slow on big DBs. 
                 # We limit to stringifying the doc for small collections or specific fields.
@@ -73,50 +202,118 @@ class MongoAdapter(DatabaseAdapter):
                          {"_id": {"$regex": search, "$options": "i"}}
                     ]
                 }
+        return query
 
-        sort_field = sort_col if sort_col else '_id'
-        if sort_field == 'id': sort_field = '_id'
-        direction = ASCENDING if sort_dir == 'asc' else DESCENDING
-
-        total = col.count_documents(query)
+    def get_rows(self, db_name, table, page, search=None, sort_col=None, sort_dir='desc', after=None, fields=None):
+        col = self.client[db_name][table]
+        # Unfiltered totals come from collection metadata instead of a counting scan
+        if search: total = col.count_documents(self._query(search))
+        else: total = ttl_cached(self._counts, (db_name, table), COUNT_CACHE_TTL, col.estimated_document_count)
         # If total is 0 and we had a search, maybe the user wants to search values, not IDs.
         # Allowing full table scan for admin tool:
         if total == 0 and search:
             # Dangerous scan!
              pass 
 
+        return with_preview(self.iter_rows(db_name, table, page, search, sort_col, sort_dir, after, fields)), total
+
+    def supports_after(self, sort_col): return sort_col in (None, '', 'id', '_id')
+
+    def preview_fields(self, db_name, table):
+        def sample():
+            # Field names come from one sampled document; narrow collections are fetched whole
+            doc = self.client[db_name][table].find_one() or {}
+            keys = [k for k in doc if k != '_id']
+            return ['_id'] + keys[:PREVIEW_FIELDS] if len(keys) > PREVIEW_FIELDS else None
+        return ttl_cached(self._previews, (db_name, table), SCHEMA_CACHE_TTL, sample)
+
+    def iter_rows(self, db_name, table, page, search=None, sort_col=None, sort_dir='desc', after=None, fields=None, batch_size=ROWS_PER_PAGE):
+        sort_field = sort_col if sort_col else '_id'
+        if sort_field == 'id': sort_field = '_id'
+        direction = ASCENDING if sort_dir == 'asc' else DESCENDING
+
+        query = self._query(search)
         skip = (page - 1) * ROWS_PER_PAGE
-        cursor = col.find(query).sort(sort_field, direction).skip(skip).limit(ROWS_PER_PAGE)
-        
-        rows = []
-        for doc in cursor:
-            doc['__id'] = str(doc['_id'])
-            rows.append(doc)
-        return rows, total
+        # Range scan on the _id index from the previous page's last id; skip() would walk every earlier document.
+        # The id arrives as a string, so its real BSON type is looked up first: comparisons only match within
+        # a type, and ids that don't round-trip through a string (ints, UUIDs...) fall back to skip().
+        # So do collections mixing _id types: a bound of one type would drop every document of the others
+        last = None
+        if after and self.supports_after(sort_col) and self._one_id_type(db_name, table):
+            last = self.client[db_name][table].find_one({'_id': {'$in': [self._coerce_id(after), after]}}, {'_id': 1})
+        if last:
+            bound = {'_id': {'$gt' if direction == ASCENDING else '$lt': last['_id']}}
+            query = {'$and': [query, bound]} if query else bound
+            skip = 0
+        # The cursor already fetches in batches, so documents are handed out as they arrive;
+        # batches are sized to the page rather than the driver's 101-document first batch
+        projection = dict.fromkeys(fields, 1) if fields else None
+        cursor = self.client[db_name][table].find(query, projection, batch_size=batch_size).sort(sort_field, direction).skip(skip).limit(ROWS_PER_PAGE)
+        # Closed as soon as the stream ends or the client goes away, rather than whenever the cursor is collected
+        with cursor:
+            for doc in cursor:
+                # bytes.hex() on the raw 12 bytes skips ObjectId.__str__'s Python-level hexlify+decode
+                oid = doc['_id']
+                doc['__id'] = oid.binary.hex() if type(oid) is ObjectId else str(oid)
+                yield doc
+
+    def _one_id_type(self, db_name, table):
+        def check():
+            # _id order groups by BSON type first, so the lowest and highest ids share a type only if every id does
+            col = self.client[db_name][table]
+            ends = [col.find_one({}, {'_id': 1}, sort=[('_id', d)]) for d in (ASCENDING, DESCENDING)]
+            if None in ends: return True
+            # Ints, longs and doubles compare with each other as one number type
+            kind = lambda v: 'number' if isinstance(v, (int, float)) and not isinstance(v, bool) else type(v).__name__
+            return kind(ends[0]['_id']) == kind(ends[1]['_id'])
+        return ttl_cached(self._id_types, (db_name, table), COUNT_CACHE_TTL, check)
+
+    @staticmethod
+    def _coerce_id(id):
+        # A hex/length check instead of raising and catching for every non-ObjectId key
+        return ObjectId(id) if ObjectId.is_valid(id) else id
 
     def get_row(self, db_name, table, id):
-        try: oid = ObjectId(id)
-        except: oid = id
-        return self.client[db_name][table].find_one({'_id': oid})
+        return self.client[db_name][table].find_one({'_id': self._coerce_id(id)})
 
     def save_row(self, db_name, table, id, data, is_new):
         col = self.client[db_name][table]
+        self._counts.pop((db_name, table), None)
+        self._id_types.pop((db_name, table), None)
         if is_new: col.insert_one(data)
         else:
-            try: oid = ObjectId(id)
-            except: oid = id
             if '_id' in data: del data['_id']
-            col.replace_one({'_id': oid}, data)
+            col.replace_one({'_id': self._coerce_id(id)}, data)
+
+    def add_rows(self, db_name, table, rows):
+        # One round trip; unordered so the server keeps going past a bad document
+        self.client[db_name][table].insert_many(rows, ordered=False)
+        self._counts.pop((db_name, table), None)
+        self._id_types.pop((db_name, table), None)
 
     def delete_row(self, db_name, table, id):
-        try: oid = ObjectId(id)
-        except: oid = id
-        self.client[db_name][table].delete_one({'_id': oid})
+        self.client[db_name][table].delete_one({'_id': self._coerce_id(id)})
+        self._counts.pop((db_name, table), None)
+
+_SCHEMA_CACHE = {}
+# isinstance against a type tuple is one C-level check, where hasattr(v, 'isoformat') raises and catches for most values
+_TIME_TYPES = (datetime.date, datetime.time)
+
+def _shape(v):
+    if isinstance(v, _TIME_TYPES): return v.isoformat()
+    if isinstance(v, bytes): return "<binary>"
+    return v
+
+# Dialects whose row listings cast dates/binaries server-side, and the text type they cast to
+_SERVER_CASTS = {'postgresql': Text, 'mysql': CHAR}
+# The editor round-trips dates as ISO strings; typed Core binds (SQLite's above all) only take the Python objects
+_ISO_PARSERS = ((DateTime, datetime.datetime.fromisoformat), (Date, datetime.date.fromisoformat), (Time, datetime.time.fromisoformat))
 
 class SQLAdapter(DatabaseAdapter):
     def __init__(self): 
         self.engine = None
         self.base_uri = ""
+        self._counts = {}
 
     def connect(self, uri, db_name=None):
         if uri.startswith("postgres://"): uri = uri.replace("postgres://", "postgresql://", 1)
@@ -131,188 +328,527 @@ class SQLAdapter(DatabaseAdapter):
             u = urlparse(uri)
             uri = urlunparse(u._replace(path=f"/{db_name}"))
 
-        self.engine = create_engine(uri)
-        with self.engine.connect() as conn: pass
+        self.engine = shared_client('sql', uri, lambda: self._new_engine(uri))
         return True
 
+    @staticmethod
+    def _new_engine(uri):
+        # pre_ping replaces the per-request probe: stale pooled connections are detected at checkout.
+        # The pool is per process, so it is sized for one worker's threads; LIFO lets surplus connections idle out
+        pool = {} if uri.startswith('sqlite') else {'pool_size': SQL_POOL_SIZE, 'max_overflow': SQL_MAX_OVERFLOW, 'pool_use_lifo': True}
+        engine = create_engine(uri, pool_pre_ping=True, pool_recycle=1800, **pool)
+        with engine.connect() as conn: pass
+        return engine
+
     def list_databases(self):
         dialect = self.engine.dialect.name
+        # Single-database dialects: the name is already on the parsed URL, no connection or re-parse needed
+        if dialect not in ('postgresql', 'mysql'): return [self.engine.url.database or 'main']
         try:
-            with self.engine.connect() as conn:
+            with self._reader() as conn:
                 if dialect == 'postgresql':
                     res = conn.execute(text("SELECT datname FROM pg_database WHERE datistemplate = false;"))
-                    return sorted([r[0] for r in res])
-                elif dialect == 'mysql':
-                    res = conn.execute(text("SHOW DATABASES;"))
-                    return sorted([r[0] for r in res])
-                else: return [urlparse(str(self.engine.url)).database or 'main']
+                else: res = conn.execute(text("SHOW DATABASES;"))
+                return sorted([r[0] for r in res])
         except: return ['default']
 
+    @contextmanager
+    def _reader(self):
+        """The request's read connection for this engine: one pool checkout (and pre-ping) per request
+        instead of one per query. Writes keep their own engine.begin() transaction."""
+        conns = g.setdefault('_sql_conns', {})
+        conn = conns.get(self.engine)
+        if conn is None: conn = conns[self.engine] = self.engine.connect()
+        try: yield conn
+        except BaseException:
+            # A failed statement aborts the transaction on Postgres; later reads in the request start clean
+            conn.rollback()
+            raise
+
+    def pool(self): return self.engine
     def drop_database(self, db_name):
         if 'postgresql' in self.engine.dialect.name:
+            # One-off maintenance connection: disposed straight away rather than left with an idle pool
             eng = create_engine(self.engine.url.set(database='postgres'))
-            conn = eng.connect()
-            conn.execution_options(isolation_level="AUTOCOMMIT")
-            conn.execute(text(f"DROP DATABASE {db_name}"))
-            conn.close()
+            try:
+                with eng.connect() as conn:
+                    conn.execution_options(isolation_level="AUTOCOMMIT")
+                    conn.execute(text(f"DROP DATABASE {self.engine.dialect.identifier_preparer.quote(db_name)}"))
+            finally: eng.dispose()
+
+    def _cache(self):
+        # Schema lookups are keyed by the full engine URL so every adapter for the same database shares them
+        key = self.engine.url.render_as_string(hide_password=False)
+        return _SCHEMA_CACHE.setdefault(key, {})
+
+    def _shared_key(self, *parts):
+        # Cross-worker cache keys never carry the URL itself, only its digest
+        return ':'.join(('dbc', uri_digest(self.engine.url.render_as_string(hide_password=False))) + parts)
+
+    def list_tables(self, db_name):
+        return ttl_cached(self._cache(), 'tables', SCHEMA_CACHE_TTL, self._query_tables, self._shared_key('tables'))
+
+    def _query_tables(self):
+        # A targeted catalog query instead of the full SQLAlchemy inspector
+        dialect = self.engine.dialect.name
+        with self._reader() as conn:
+            if dialect == 'postgresql':
+                res = conn.execute(text("SELECT tablename FROM pg_catalog.pg_tables WHERE schemaname = current_schema()"))
+            elif dialect == 'mysql':
+                res = conn.execute(text("SHOW TABLES"))
+            elif dialect == 'sqlite':
+                res = conn.execute(text("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'"))
+            else: res = None
+            return sorted(r[0] for r in res) if res is not None else sorted(inspect(conn).get_table_names())
 
-    def list_tables(self, db_name): return sorted(inspect(self.engine).get_table_names())
     def drop_table(self, db_name, table): 
-        with self.engine.begin() as conn: conn.execute(text(f"DROP TABLE {table}"))
+        with self.engine.begin() as conn: conn.execute(text(f"DROP TABLE {self.engine.dialect.identifier_preparer.quote(table)}"))
+        self._forget_count(table)
+        self._cache().pop('tables', None)
+        forget_shared(self._shared_key('tables'))
+        for name in ('reflected', 'pks'): self._cache().get(name, {}).pop(table, None)
+
+    def _table(self, table):
+        # Select lists and statements built from a reflection live in its .info, so they expire together
+        return ttl_cached(self._cache().setdefault('reflected', {}), table, SCHEMA_CACHE_TTL,
+                          lambda: Table(table, MetaData(), autoload_with=self.engine))
+
+    def _select_list(self, tbl, fields=None):
+        """Columns for row listings; dates and binaries are shaped by the server so Python never sees them."""
+        as_text = _SERVER_CASTS.get(self.engine.dialect.name)
+        if not (as_text or fields): return None
+
+        lists = tbl.info.setdefault('select_lists', {})
+        key = tuple(fields) if fields else None
+        if key in lists: return lists[key]
+
+        cols = []
+        for c in tbl.columns:
+            if fields and c.name not in fields: continue
+            if as_text and isinstance(c.type, (Date, DateTime, Time)): cols.append(cast(c, as_text).label(c.name))
+            elif as_text and isinstance(c.type, (LargeBinary, BINARY, VARBINARY)): cols.append(literal_column("'<binary>'").label(c.name))
+            else: cols.append(c)
+        lists[key] = cols
+        return cols
+
+    def preview_fields(self, db_name, table):
+        try: cols = [c.name for c in self._table(table).columns]
+        except Exception: return None
+        if len(cols) <= PREVIEW_FIELDS: return None
+        pk = self.get_pk(table)
+        return [pk] + [c for c in cols if c != pk][:PREVIEW_FIELDS - 1]
+
+    def _by_pk(self, table):
+        """Single-row select/update/delete and the plain insert for a table, built once per reflection.
+        Update SETs whichever columns the parameters carry, so one statement serves every column set."""
+        tbl = self._table(table)
+        stmts = tbl.info.get('by_pk')
+        if stmts is None:
+            key = tbl.c[self.get_pk(table)]
+            stmts = tbl.info['by_pk'] = SimpleNamespace(
+                select=select(tbl).where(key == bindparam('id')),
+                update=tbl.update().where(key == bindparam('pk_val')),
+                delete=tbl.delete().where(key == bindparam('id')),
+                insert=tbl.insert(),
+            )
+        return stmts
 
     def get_pk(self, table):
+        return ttl_cached(self._cache().setdefault('pks', {}), table, SCHEMA_CACHE_TTL, lambda: self._query_pk(table))
+
+    def _query_pk(self, table):
+        # Read off the cached reflection rather than a separate inspector roundtrip
         try:
-            pk = inspect(self.engine).get_pk_constraint(table)
-            return pk['constrained_columns'][0] if pk['constrained_columns'] else 'id'
+            pk = self._table(table).primary_key.columns.keys()
+            return pk[0] if pk else 'id'
         except: return 'id'
 
-    def get_rows(self, db_name, table, page, search=None, sort_col=None, sort_dir='desc'):
+    def _where(self, tbl, pk, search):
+        if not search: return None
+        pattern = f"%{search}%"
+        # DEEP SEARCH FOR SQL: Postgres casts the whole row to text, others fall back to the PK
+        if self.engine.dialect.name == 'postgresql': return cast(tbl.table_valued(), Text).ilike(pattern)
+        return cast(tbl.c[pk], String).like(pattern)
+
+    # Keyset needs a unique sort key; iter_rows only seeks when the sort column resolves to a single-column primary key
+    def supports_after(self, sort_col): return sort_col in (None, '', 'id')
+
+    def get_rows(self, db_name, table, page, search=None, sort_col=None, sort_dir='desc', after=None, fields=None):
+        if search: total = self._count(table, self._where(self._table(table), self.get_pk(table), search))
+        else: total = ttl_cached(self._counts, table, COUNT_CACHE_TTL, lambda: self._count(table), self._shared_key('count', table))
+        return with_preview(self.iter_rows(db_name, table, page, search, sort_col, sort_dir, after, fields)), total
+
+    def _forget_count(self, table):
+        self._counts.pop(table, None)
+        forget_shared(self._shared_key('count', table))
+
+    def _count(self, table, where=None):
+        try:
+            with self._reader() as conn:
+                # Catalog estimates are free; only trust them for big tables where COUNT(*) hurts
+                est = None
+                if where is None and self.engine.dialect.name == 'postgresql':
+                    est = conn.execute(text("SELECT c.reltuples::bigint FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace "
+                                            "WHERE c.relname = :t AND n.nspname = current_schema()"), {"t": table}).scalar()
+                elif where is None and self.engine.dialect.name == 'mysql':
+                    est = conn.execute(text("SELECT table_rows FROM information_schema.tables "
+                                            "WHERE table_schema = DATABASE() AND table_name = :t"), {"t": table}).scalar()
+                if est is not None and est >= EXACT_COUNT_LIMIT: return est
+                stmt = select(func.count()).select_from(self._table(table))
+                return conn.execute(stmt if where is None else stmt.where(where)).scalar()
+        except: return 0
+
+    def iter_rows(self, db_name, table, page, search=None, sort_col=None, sort_dir='desc', after=None, fields=None):
+        # Core statements over the reflected table: identifiers are quoted by the dialect and the
+        # compiled form is reused by SQLAlchemy's statement cache instead of re-parsing fresh SQL text
+        tbl = self._table(table)
         pk = self.get_pk(table)
-        sort_field = sort_col if sort_col else pk
+        sort_by = tbl.c[sort_col] if sort_col and sort_col in tbl.c else tbl.c[pk]
+        cols = self._select_list(tbl, fields)
+        shaped = cols is not None and self.engine.dialect.name in _SERVER_CASTS
+        stmt = select(*cols) if cols else select(tbl)
+        where = self._where(tbl, pk, search)
+        if where is not None: stmt = stmt.where(where)
         offset = (page - 1) * ROWS_PER_PAGE
-        
-        where_clause = ""
-        params = {}
-        
-        if search:
-            # DEEP SEARCH FOR SQL
-            if 'postgresql' in self.engine.dialect.name:
-                # Cast whole row to text and search
-                where_clause = f"WHERE {table}::text ILIKE :search"
-                params['search'] = f"%{search}%"
+        # Only a single-column primary key is unique; get_pk names just the first column of a composite one
+        if after is not None and sort_by.name == pk and len(tbl.primary_key.columns) == 1:
+            # Keyset: seek past the previous page's last key on the PK index instead of reading and discarding OFFSET rows
+            try: after = sort_by.type.python_type(after)
+            except Exception: pass
+            stmt = stmt.where(sort_by > after if sort_dir == 'asc' else sort_by < after)
+            offset = 0
+        stmt = stmt.order_by(sort_by.asc() if sort_dir == 'asc' else sort_by.desc()).limit(ROWS_PER_PAGE).offset(offset)
+
+        # Server-side cursor where the driver supports it, so rows are shaped and sent as they arrive.
+        # Set on the statement: the connection is shared with the request's other reads
+        with self._reader() as conn:
+            result = conn.execute(stmt.execution_options(stream_results=True, yield_per=50)).mappings()
+            if shaped:
+                # Server already shaped the values: one dict build per row, __id included
+                for m in result: yield {**m, '__id': str(m.get(pk))}
             else:
-                # MySQL/Other: Fallback to PK search
-                where_clause = f"WHERE {pk} LIKE :search"
-                params['search'] = f"%{search}%"
-
-        sql_count = text(f"SELECT COUNT(*) FROM {table} {where_clause}")
-        sql_rows = text(f"SELECT * FROM {table} {where_clause} ORDER BY {sort_field} {sort_dir.upper()} LIMIT {ROWS_PER_PAGE} OFFSET {offset}")
-
-        with self.engine.connect() as conn:
-            try: total = conn.execute(sql_count, params).scalar()
-            except: total = 0
-            
-            result = conn.execute(sql_rows, params)
-            rows = []
-            for r in result:
-                d = dict(r._mapping)
-                for k,v in d.items():
-                    if hasattr(v, 'isoformat'): d[k] = v.isoformat()
-                    if isinstance(v, bytes): d[k] = "<binary>"
-                d['__id'] = str(d.get(pk))
-                rows.append(d)
-            return rows, total
+                for m in result:
+                    d = {k: _shape(v) for k, v in m.items()}
+                    d['__id'] = str(d.get(pk))
+                    yield d
 
     def get_row(self, db_name, table, id):
-        pk = self.get_pk(table)
-        with self.engine.connect() as conn:
-            res = conn.execute(text(f"SELECT * FROM {table} WHERE {pk} = :id"), {"id": id}).mappings().first()
+        with self._reader() as conn:
+            res = conn.execute(self._by_pk(table).select, {"id": id}).mappings().first()
             if res:
-                d = dict(res)
-                for k,v in d.items():
-                    if hasattr(v, 'isoformat'): d[k] = v.isoformat()
-                return d
+                return {k: (v.isoformat() if isinstance(v, _TIME_TYPES) else v) for k, v in res.items()}
             return None
 
+    def _parse_times(self, table, row):
+        tbl = self._table(table)
+        for k, v in row.items():
+            if not isinstance(v, str) or k not in tbl.c: continue
+            parse = next((p for t, p in _ISO_PARSERS if isinstance(tbl.c[k].type, t)), None)
+            if parse is None: continue
+            try: row[k] = parse(v)
+            except ValueError: pass
+        return row
+
     def save_row(self, db_name, table, id, data, is_new):
-        pk = self.get_pk(table)
+        self._forget_count(table)
         if '__id' in data: del data['__id']
+        self._parse_times(table, data)
         with self.engine.begin() as conn:
-            if is_new:
-                cols = ", ".join(data.keys())
-                vals = ", ".join([f":{k}" for k in data.keys()])
-                conn.execute(text(f"INSERT INTO {table} ({cols}) VALUES ({vals})"), data)
+            if is_new: conn.execute(self._by_pk(table).insert, data)
             else:
-                sets = ", ".join([f"{k}=:{k}" for k in data.keys()])
                 data['pk_val'] = id
-                conn.execute(text(f"UPDATE {table} SET {sets} WHERE {pk} = :pk_val"), data)
+                conn.execute(self._by_pk(table).update, data)
+
+    def add_rows(self, db_name, table, rows):
+        # A list of parameter sets runs as executemany, which SQLAlchemy batches into multi-row INSERTs.
+        # executemany takes its columns from the first set, so rows are grouped by key set, one batch per shape
+        shapes = {}
+        for row in rows:
+            row.pop('__id', None)
+            shapes.setdefault(frozenset(self._parse_times(table, row)), []).append(row)
+        with self.engine.begin() as conn:
+            for batch in shapes.values(): conn.execute(self._by_pk(table).insert, batch)
+        self._forget_count(table)
 
     def delete_row(self, db_name, table, id):
-        pk = self.get_pk(table)
         with self.engine.begin() as conn:
-            conn.execute(text(f"DELETE FROM {table} WHERE {pk} = :id"), {"id": id})
+            conn.execute(self._by_pk(table).delete, {"id": id})
+        self._forget_count(table)
 
 class RedisAdapter(DatabaseAdapter):
-    def __init__(self): self.r = None
+    def __init__(self):
+        self.r = None
+        self._counts = {}
+        self._cursors = {}
     def connect(self, uri, db_name=None):
-        self.r = redis.from_url(uri, decode_responses=True)
-        if db_name:
-            try:
-                self.r = redis.Redis(**self.r.connection_pool.connection_kwargs, db=int(db_name.replace("DB", "").strip()), decode_responses=True)
-            except: pass
-        self.r.ping()
+        self.r = shared_client('redis', f"{uri}#{db_name or ''}", lambda: self._new_client(uri, db_name))
         return True
 
+    @staticmethod
+    def _new_client(uri, db_name):
+        r = redis.from_url(uri, decode_responses=True)
+        if db_name:
+            # Same connection settings (TLS included) on a pool bound to the chosen DB index; passing db
+            # alongside connection_kwargs raised a duplicate-keyword TypeError, so the DB was never switched
+            pool = r.connection_pool
+            kwargs = dict(pool.connection_kwargs, db=int(db_name.replace("DB", "").strip()))
+            r = redis.Redis(connection_pool=redis.ConnectionPool(connection_class=pool.connection_class, **kwargs))
+        r.ping()
+        return r
+
     def list_databases(self): return [f"DB {i}" for i in range(16)]
-    def drop_database(self, db_name): self.r.flushdb()
+    # ASYNC flush / UNLINK reclaim memory on a Redis background thread instead of blocking the server
+    def pool(self): return self.r
+    def drop_database(self, db_name): self.r.flushdb(asynchronous=True)
     def list_tables(self, db_name): return ["Keys"]
-    def drop_table(self, db_name, table): self.r.flushdb()
+    def drop_table(self, db_name, table): self.r.flushdb(asynchronous=True)
 
-    def get_rows(self, db_name, table, page, search=None, sort_col=None, sort_dir='desc'):
+    def _page_keys(self, page, search, sort_dir):
+        # SCAN instead of KEYS: cursor-bounded batches never stall the server on a big keyspace
         pattern = f"*{search}*" if search else "*"
-        keys = sorted(self.r.keys(pattern), reverse=(sort_dir=='desc'))
-        total = len(keys)
-        start = (page - 1) * ROWS_PER_PAGE
-        page_keys = keys[start : start + ROWS_PER_PAGE]
-        rows = []
-        for k in page_keys:
-            t = self.r.type(k)
-            v = self.r.get(k) if t == 'string' else f"({t})"
-            rows.append({'__id': k, 'type': t, 'value': v})
-        return rows, total
+        size = self.r.dbsize()
+        if size <= REDIS_SORT_LIMIT:
+            keys = sorted(self.r.scan_iter(pattern, count=REDIS_SCAN_COUNT), reverse=(sort_dir=='desc'))
+            start = (page - 1) * ROWS_PER_PAGE
+            return keys[start : start + ROWS_PER_PAGE], len(keys)
+        if search: total = ttl_cached(self._counts, pattern, COUNT_CACHE_TTL, lambda: sum(1 for _ in self.r.scan_iter(pattern, count=REDIS_SCAN_COUNT)))
+        else: total = size
+        return self._scan_page(pattern, page), total
+
+    def _scan_page(self, pattern, page):
+        """One page of keys in SCAN order, resuming from the nearest page start seen so far rather than cursor 0."""
+        # page -> (cursor of the batch holding its first key, index of that key in the batch)
+        starts = ttl_cached(self._cursors, pattern, COUNT_CACHE_TTL, lambda: {1: (0, 0)})
+        from_page = max(p for p in starts if p <= page)
+        cursor, skip = starts[from_page]
+        pos, first, last = (from_page - 1) * ROWS_PER_PAGE, (page - 1) * ROWS_PER_PAGE, page * ROWS_PER_PAGE
+        keys = []
+        while True:
+            next_cursor, batch = self.r.scan(cursor, match=pattern, count=REDIS_SCAN_COUNT)
+            for i in range(skip, len(batch)):
+                if pos % ROWS_PER_PAGE == 0: starts[pos // ROWS_PER_PAGE + 1] = (cursor, i)
+                if pos >= first: keys.append(batch[i])
+                pos += 1
+                if pos == last: return keys
+            if next_cursor == 0: return keys
+            cursor, skip = next_cursor, 0
+
+    def _rows(self, keys):
+        # Two pipelined round trips for the whole page (all TYPEs, then the string values) instead of two per key
+        pipe = self.r.pipeline(transaction=False)
+        for k in keys: pipe.type(k)
+        types = pipe.execute()
+        for k, t in zip(keys, types):
+            if t == 'string': pipe.get(k)
+        values = iter(pipe.execute())
+        return [{'__id': k, 'type': t, 'value': next(values) if t == 'string' else f"({t})"} for k, t in zip(keys, types)]
+
+    def get_rows(self, db_name, table, page, search=None, sort_col=None, sort_dir='desc', after=None, fields=None):
+        page_keys, total = self._page_keys(page, search, sort_dir)
+        return with_preview(self._rows(page_keys)), total
+
+    def iter_rows(self, db_name, table, page, search=None, sort_col=None, sort_dir='desc', after=None, fields=None):
+        page_keys, _ = self._page_keys(page, search, sort_dir)
+        yield from self._rows(page_keys)
 
     def get_row(self, db_name, table, id):
-        t = self.r.type(id)
+        # GET rides along with TYPE: strings (the common case) take one round trip, other types a second
+        t, val = self.r.pipeline(transaction=False).type(id).get(id).execute(raise_on_error=False)
         if t == 'none': return None
-        val = None
-        if t == 'string': val = self.r.get(id)
-        elif t == 'hash': val = self.r.hgetall(id)
+        if t == 'hash': val = self.r.hgetall(id)
         elif t == 'list': val = self.r.lrange(id, 0, -1)
         elif t == 'set': val = list(self.r.smembers(id))
+        elif t != 'string': val = None
         return {'key': id, 'type': t, 'value': val}
 
     def save_row(self, db_name, table, id, data, is_new):
         key = data.get('key', id)
         val = data.get('value')
-        if isinstance(val, dict): self.r.hset(key, mapping=val)
-        elif isinstance(val, list): 
-            self.r.delete(key)
-            self.r.rpush(key, *val)
-        else: self.r.set(key, str(val))
-    def delete_row(self, db_name, table, id): self.r.delete(id)
+        # Replace the key in one MULTI/EXEC round trip: readers never see it missing or half-written
+        with self.r.pipeline(transaction=True) as pipe:
+            pipe.delete(key)
+            if isinstance(val, dict):
+                if val: pipe.hset(key, mapping=val)
+            elif isinstance(val, list):
+                if val: pipe.rpush(key, *val)
+            else: pipe.set(key, str(val))
+            pipe.execute()
+    def delete_row(self, db_name, table, id): self.r.unlink(id)
+
+def with_preview(rows):
+    # Serialize each listed row once, in C, and keep only the truncated '__preview' the table cell
+    # escapes and highlights. Whole rows never go into the page: Copy fetches the raw-row endpoint
+    for row in rows:
+        raw = dump_json(row).decode()
+        row['__preview'] = raw if len(raw) <= PREVIEW_CHARS else raw[:PREVIEW_CHARS] + '…'
+        yield row
+
+def prime(rows):
+    """Pulls the first row eagerly so query errors raise in the view rather than mid-stream."""
+    first = next(rows, None)
+    return rows if first is None else itertools.chain([first], rows)
+
+# Listing pages by (URI digest, db, table, page, query state) -> (stored at, rows, total), in LRU order
+_ROWS_CACHE = OrderedDict()
+_ROWS_LOCK = threading.Lock()
+
+def cached_rows(key, fetch, ttl=ROWS_CACHE_TTL):
+    """Serves a listing page from the TTL/LRU cache, or streams fetch()'s rows and keeps them for ttl once fully read.
+    The third value is the cached entry's timestamp on a hit (a version for ETags), None on a miss."""
+    with _ROWS_LOCK:
+        hit = _ROWS_CACHE.get(key)
+        if _fresh(hit):
+            _ROWS_CACHE.move_to_end(key)
+            return iter(hit[1]), hit[2], hit[0]
+    rows, total = fetch()
+    return _keep_rows(key, rows, total, ttl), total, None
+
+# Entries are (stored at, rows, total, ttl); expired ones stay in the LRU until evicted or overwritten
+def _fresh(hit): return hit is not None and time.monotonic() - hit[0] < hit[3]
+
+def _keep_rows(key, rows, total, ttl):
+    kept = []
+    for row in rows:
+        kept.append(row)
+        yield row
+    with _ROWS_LOCK:
+        _ROWS_CACHE[key] = (time.monotonic(), kept, total, ttl)
+        _ROWS_CACHE.move_to_end(key)
+        while len(_ROWS_CACHE) > ROWS_CACHE_SIZE: _ROWS_CACHE.popitem(last=False)
+
+def rows_key(digest, db_name, table, page=1, search=None, sort_col=None, sort_dir='desc', after=None):
+    return (digest, db_name, table, page, search, sort_col, sort_dir, after, _rows_version(digest, db_name, table))
+
+def _rows_version(digest, db_name, table):
+    # Write counters in SHARED_CACHE, bumped by forget_rows, so a write on one worker retires every worker's pages.
+    # Without it there is nothing to share: other workers serve their copy until its TTL runs out
+    if SHARED_CACHE is None: return None
+    try: return tuple(SHARED_CACHE.mget(f"dbc:rows:{digest}:{db_name}", f"dbc:rows:{digest}:{db_name}:{table}"))
+    except redis.RedisError: return None
+
+# A handful of threads shared by all requests, so prewarming never fans out past the pool size.
+# The executor's own queue is unbounded, so jobs are only submitted while _WARMING (queued or running) has room
+_WARM_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix='warm')
+_WARMING = set()
+
+def warm_rows(adp, digest, db_name, tables):
+    """Fills the listing cache with the default first page of the first WARM_TABLES tables, in the background."""
+    for table in tables[:WARM_TABLES]:
+        key = rows_key(digest, db_name, table)
+        with _ROWS_LOCK:
+            if _fresh(_ROWS_CACHE.get(key)) or key in _WARMING: continue
+            if len(_WARMING) >= WARM_QUEUE_LIMIT: return
+            _WARMING.add(key)
+        _WARM_POOL.submit(_warm, adp, key, db_name, table)
+
+def _warm(adp, key, db_name, table):
+    # Its own app context: SQL reads keep their connection on g, released at teardown
+    with app.app_context():
+        try:
+            # Kept for WARM_ROWS_TTL rather than ROWS_CACHE_TTL, or the page would expire before anyone opens it
+            rows, _, _ = cached_rows(key, lambda: adp.get_rows(db_name, table, 1, fields=adp.preview_fields(db_name, table)), WARM_ROWS_TTL)
+            for _ in rows: pass
+        except Exception as e: logging.warning(e)
+        finally:
+            with _ROWS_LOCK: _WARMING.discard(key)
+
+def forget_rows(*prefix):
+    """Drops cached pages whose key starts with prefix, e.g. (uri digest, db, table) after a write."""
+    with _ROWS_LOCK:
+        for key in [k for k in _ROWS_CACHE if k[:len(prefix)] == prefix]: del _ROWS_CACHE[key]
+    if SHARED_CACHE is not None:
+        try: SHARED_CACHE.incr(':'.join(('dbc:rows',) + prefix))
+        except redis.RedisError: pass
+
+# URI scheme -> adapter class; anything unlisted is handed to SQLAlchemy
+_ADAPTERS = {
+    'mongodb': MongoAdapter, 'mongodb+srv': MongoAdapter,
+    'redis': RedisAdapter, 'rediss': RedisAdapter,
+    'postgresql': SQLAdapter, 'postgres': SQLAdapter,
+    'mysql': SQLAdapter, 'mysql+pymysql': SQLAdapter,
+    'sqlite': SQLAdapter,
+}
+
+# Connected adapters are stateless apart from their shared client, so one per (URI, database) serves every request
+# Adapters by (URI digest, db) in LRU order, capped like the clients they wrap
+_ADAPTER_CACHE = OrderedDict()
 
 def get_adapter(db_name=None):
     uri = session.get('db_uri')
     if not uri: return None
-    try:
-        if uri.startswith('mongo'): adp = MongoAdapter()
-        elif 'redis' in uri: adp = RedisAdapter()
-        else: adp = SQLAdapter()
-        adp.connect(uri, db_name)
-        return adp
-    except Exception as e:
-        logging.error(e)
-        return None
+    key = (uri_digest(uri), db_name)
+    per_request = g.setdefault('_adapters', {})
+    if key in per_request: return per_request[key]
+
+    with _CLIENTS_LOCK:
+        adp = _ADAPTER_CACHE.get(key)
+        if adp is not None: _ADAPTER_CACHE.move_to_end(key)
+    if adp is None:
+        try:
+            adp = _ADAPTERS.get(urlparse(uri).scheme.lower(), SQLAdapter)()
+            adp.connect(uri, db_name)
+        except Exception as e:
+            logging.error(e)
+            return None
+        with _CLIENTS_LOCK:
+            adp = _ADAPTER_CACHE.setdefault(key, adp)
+            while len(_ADAPTER_CACHE) > MAX_CLIENTS: _ADAPTER_CACHE.popitem(last=False)
+    per_request[key] = adp
+    return adp
+
+def forget_adapter(db_name):
+    """Drops db_name's cached adapter and closes its pool, unless the server-level adapter runs on the same one."""
+    digest = uri_digest(session['db_uri'])
+    g.get('_adapters', {}).pop((digest, db_name), None)
+    with _CLIENTS_LOCK:
+        adp = _ADAPTER_CACHE.pop((digest, db_name), None)
+        root = _ADAPTER_CACHE.get((digest, None))
+    if adp is not None and (root is None or root.pool() is not adp.pool()): release_client(adp.pool())
+
+@app.teardown_appcontext
+def close_sql_readers(exc):
+    # Returns the request's shared SQL read connections to their pools (rolling back the read transaction)
+    for conn in g.pop('_sql_conns', {}).values(): conn.close()
 
 # ==========================================
 # UI TEMPLATES (RICH APIS STYLE)
 # ==========================================
 
-BASE_LAYOUT = """
+# Icons are built once as Markup so templates emit them without re-escaping
+ICONS = {
+    'external': Markup('<svg class="w-3 h-3" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M10 6H6a2 2 0 00-2 2v10a2 2 0 002 2h10a2 2 0 002-2v-4M14 4h6m0 0v6m0-6L10 14" /></svg>'),
+}
+
+# The shared part of the document head has no per-request parts: it is rendered once at import and sent
+# as pre-encoded bytes. BASE_LAYOUT closes the head, after an extra_head block for page-specific assets.
+HEAD_LAYOUT = """
 <!DOCTYPE html>
 <html lang="en" class="h-full bg-[#FDFBF7]">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Links4u DB Compass</title>
-    <link href="https://fonts.googleapis.com/css2?family=DM+Sans:wght@400;500;700&family=Playfair+Display:wght@700&display=swap" rel="stylesheet">
-    <script src="https://cdn.tailwindcss.com"></script>
-    <script src="https://cdn.jsdelivr.net/npm/alpinejs@3.x.x/dist/cdn.min.js" defer></script>
-    <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/codemirror/5.65.5/codemirror.min.css">
-    <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/codemirror/5.65.5/theme/neo.min.css">
-    <script src="https://cdnjs.cloudflare.com/ajax/libs/codemirror/5.65.5/codemirror.min.js"></script>
-    <script src="https://cdnjs.cloudflare.com/ajax/libs/codemirror/5.65.5/mode/javascript/javascript.min.js"></script>
-
+    {% if vendored('bundle.css') %}
+    <link rel="stylesheet" href="{{ asset('bundle.css') }}">
+    {% else %}
+    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
+    <link rel="preload" as="style" href="{{ fonts_url }}">
+    <link rel="stylesheet" href="{{ fonts_url }}" media="print" onload="this.media='all'">
+    {% if vendored('styles.css') %}
+    <link rel="stylesheet" href="{{ asset('styles.css') }}">
+    {% else %}
+    <script src="{{ asset('tailwind.js') }}"></script>
+    {% endif %}
+    {% endif %}
+    {% if vendored('bundle.js') %}
+    <script src="{{ asset('bundle.js') }}" defer></script>
+    {% else %}
+    <script src="{{ asset('alpine.min.js') }}" defer></script>
+    <script src="{{ asset('htmx.min.js') }}" defer></script>
+    {% endif %}
+
+    {% if not vendored('styles.css') %}
+    <!-- In-browser Tailwind fallback for un-built checkouts; keep in sync with tailwind.config.js -->
     <script>
         tailwind.config = {
             theme: {
@@ -331,6 +867,7 @@ BASE_LAYOUT = """
             }
         }
     </script>
+    {% endif %}
     <style>
         .neo-box { border: 2px solid #1C1917; background: white; box-shadow: 4px 4px 0px 0px #1C1917; transition: all 0.2s; }
         .neo-box:hover { transform: translate(-2px, -2px); box-shadow: 6px 6px 0px 0px #1C1917; }
@@ -338,8 +875,11 @@ BASE_LAYOUT = """
         .neo-btn:hover { background: #86EFAC; transform: translate(-2px, -2px); box-shadow: 4px 4px 0px 0px #1C1917; }
         .neo-input { border: 2px solid #1C1917; outline: none; transition: all 0.2s; }
         .neo-input:focus { background: #F0FDF4; box-shadow: 4px 4px 0px 0px #1C1917; }
-        .CodeMirror { height: 100%; font-family: 'DM Sans', monospace; border: 2px solid #1C1917; }
     </style>
+"""
+
+BASE_LAYOUT = """
+{% block extra_head %}{% endblock %}
 </head>
 <body class="h-full flex flex-col text-brand-dark" x-data="{ infoOpen: false }">
 
@@ -434,11 +974,7 @@ DASHBOARD_TEMPLATE = """
             <div class="font-serif font-bold text-xl truncate" title="{{ session.get('db_uri') }}">Database Host</div>
         </div>
         <nav class="flex-grow overflow-y-auto p-4 space-y-2">
-            {% for db in dbs %}
-            <a href="{{ url_for('list_tables', db_name=db) }}" class="block px-4 py-3 border-2 {{ 'bg-brand-accent border-brand-dark font-bold shadow-[2px_2px_0_0_#000]' if session.get('current_db_name') == db else 'border-transparent hover:border-brand-dark hover:bg-gray-50' }} transition-all truncate">
-                {{ db }}
-            </a>
-            {% endfor %}
+            {{ sidebar_html(dbs) }}
         </nav>
     </aside>
 
@@ -492,47 +1028,78 @@ ROWS_TEMPLATE = """
         
         <div class="flex gap-3 w-full md:w-auto">
             <form method="GET" class="flex w-full md:w-auto relative group">
-                <input type="text" name="q" value="{{ request.args.get('q', '') }}" placeholder="Deep Search..." 
+                <input type="text" name="q" value="{{ nav.q }}" placeholder="Deep Search..." 
                        class="neo-input pl-4 pr-10 py-2 w-64 md:w-80 font-bold text-sm">
                 <button type="submit" class="absolute right-2 top-1/2 -translate-y-1/2 font-bold hover:text-brand-accent">&rarr;</button>
             </form>
             
             <a href="{{ url_for('view_raw_table', db_name=db_name, table=table) }}" target="_blank" class="neo-btn bg-gray-100 px-4 py-2 text-xs flex items-center gap-2">
                 <span>RAW VIEW</span>
-                <svg class="w-3 h-3" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M10 6H6a2 2 0 00-2 2v10a2 2 0 002 2h10a2 2 0 002-2v-4M14 4h6m0 0v6m0-6L10 14" /></svg>
+                {{ ICONS.external }}
             </a>
 
             <a href="{{ url_for('edit_row', db_name=db_name, table=table, id='new') }}" class="neo-btn bg-brand-dark text-white px-4 py-2 text-xs hover:text-brand-dark">+ NEW</a>
         </div>
     </div>
 
+    <div id="rows-panel" class="flex-grow flex flex-col">
+        {% include '_rows_fragment.html' %}
+    </div>
+</div>
+<script>
+// One delegated listener covers every row, including rows swapped in by HTMX
+document.addEventListener('click', function (e) {
+    const btn = e.target.closest('[data-copy-url]');
+    if (!btn) return;
+    // The clipboard write must start inside the click (Safari drops it after an await), so the row goes in as a pending blob
+    const text = fetch(btn.dataset.copyUrl).then(r => r.ok ? r.text() : Promise.reject(r.status));
+    let copy;
+    try {
+        copy = window.ClipboardItem
+            ? navigator.clipboard.write([new ClipboardItem({'text/plain': text.then(t => new Blob([t], {type: 'text/plain'}))})])
+            : text.then(t => navigator.clipboard.writeText(t));
+    } catch (err) { copy = Promise.reject(err); }
+    const show = label => { btn.textContent = label; setTimeout(() => { btn.textContent = 'Copy'; }, 1500); };
+    copy.then(() => show('Copied'), () => show('Copy failed'));
+});
+</script>
+{% endblock %}
+"""
+
+# Table body + pagination; sort and page links swap just this part in via HTMX
+ROWS_FRAGMENT_TEMPLATE = """
     <div class="flex-grow overflow-auto p-6">
         <div class="bg-white neo-box w-full">
             <table class="w-full text-left border-collapse">
                 <thead class="bg-gray-50 border-b-2 border-brand-dark text-xs uppercase font-bold tracking-wider">
                     <tr>
                         <th class="p-4 border-r-2 border-brand-dark w-32">Actions</th>
-                        <th class="p-4 border-r-2 border-brand-dark w-48 cursor-pointer hover:bg-brand-accent transition-colors" onclick="updateSort('id')">
+                        <th class="p-4 border-r-2 border-brand-dark w-48 cursor-pointer hover:bg-brand-accent transition-colors"
+                            hx-get="{{ nav.sort_url }}" hx-target="#rows-panel" hx-push-url="true">
                             ID {{ '↓' if sort_col == 'id' and sort_dir == 'desc' else '↑' if sort_col == 'id' else '' }}
                         </th>
                         <th class="p-4">Data Preview</th>
                     </tr>
                 </thead>
                 <tbody class="divide-y-2 divide-gray-100 font-sans text-sm">
+                    {% set last = namespace(id=None) %}
                     {% for row in rows %}
+                    {% set last.id = row['__id'] %}
                     <tr class="hover:bg-brand-accent/10 transition-colors group">
                         <td class="p-4 border-r-2 border-brand-dark flex gap-2">
                             <a href="{{ url_for('edit_row', db_name=db_name, table=table, id=row['__id']) }}" class="font-bold text-brand-dark hover:underline">Edit</a>
                             <form method="POST" action="{{ url_for('delete_row', db_name=db_name, table=table, id=row['__id']) }}" onsubmit="return confirm('Delete?');">
                                 <button class="font-bold text-red-500 hover:underline">Del</button>
                             </form>
-                            <a href="{{ url_for('view_raw_row', db_name=db_name, table=table, id=row['__id']) }}" target="_blank" class="font-bold text-gray-400 hover:text-brand-dark" title="Raw JSON">Raw</a>
+                            {% set raw_url = url_for('view_raw_row', db_name=db_name, table=table, id=row['__id']) %}
+                            <a href="{{ raw_url }}" target="_blank" class="font-bold text-gray-400 hover:text-brand-dark" title="Raw JSON">Raw</a>
+                            <button type="button" data-copy-url="{{ raw_url }}" class="font-bold text-gray-400 hover:text-brand-dark" title="Copy JSON">Copy</button>
                         </td>
                         <td class="p-4 border-r-2 border-brand-dark font-mono font-bold text-gray-600 truncate max-w-[150px] align-top">
-                            {{ row['__id'] }}
+                            {{ row['__id'] | highlight(nav.q) }}
                         </td>
                         <td class="p-4 font-mono text-xs text-gray-500 break-all align-top">
-                            {{ row | to_json }}
+                            {{ row['__preview'] | highlight(nav.q) }}
                         </td>
                     </tr>
                     {% else %}
@@ -545,30 +1112,34 @@ ROWS_TEMPLATE = """
 
     <div class="p-4 bg-white border-t-2 border-brand-dark flex justify-between items-center shrink-0">
         <span class="font-bold text-xs uppercase text-gray-400">Total: {{ total }}</span>
-        <div class="flex gap-2">
+        <div class="flex gap-2" hx-boost="true" hx-target="#rows-panel">
             {% if page > 1 %}
-            <a href="?page={{ page - 1 }}&q={{ request.args.get('q','') }}&sort={{ sort_col }}&dir={{ sort_dir }}" class="neo-btn px-3 py-1 bg-white text-xs">&larr; PREV</a>
+            <a href="{{ nav.prev_url }}" class="neo-btn px-3 py-1 bg-white text-xs">&larr; PREV</a>
             {% endif %}
             <span class="px-3 py-1 font-bold">{{ page }}</span>
             {% if total > page * 25 %}
-            <a href="?page={{ page + 1 }}&q={{ request.args.get('q','') }}&sort={{ sort_col }}&dir={{ sort_dir }}" class="neo-btn px-3 py-1 bg-white text-xs">NEXT &rarr;</a>
+            <a href="{{ nav.next_url }}{% if nav.keyset and last.id %}&after={{ last.id | urlencode }}{% endif %}" class="neo-btn px-3 py-1 bg-white text-xs">NEXT &rarr;</a>
             {% endif %}
         </div>
     </div>
-</div>
-<script>
-function updateSort(col) {
-    const url = new URL(window.location);
-    url.searchParams.set('sort', col);
-    url.searchParams.set('dir', url.searchParams.get('dir') === 'asc' ? 'desc' : 'asc');
-    window.location = url;
-}
-</script>
-{% endblock %}
 """
 
 EDITOR_TEMPLATE = """
 {% extends 'base.html' %}
+{% block extra_head %}
+    {% if vendored('editor.js') %}
+    <link rel="stylesheet" href="{{ asset('editor.css') }}">
+    <script src="{{ asset('editor.js') }}"></script>
+    {% else %}
+    <link rel="stylesheet" href="{{ asset('codemirror.min.css') }}">
+    <link rel="stylesheet" href="{{ asset('neo.min.css') }}">
+    <script src="{{ asset('codemirror.min.js') }}"></script>
+    <script src="{{ asset('javascript.min.js') }}"></script>
+    {% endif %}
+    <style>
+        .CodeMirror { height: 100%; font-family: 'DM Sans', monospace; border: 2px solid #1C1917; }
+    </style>
+{% endblock %}
 {% block content %}
 <div class="h-full flex flex-col min-h-[calc(100vh-80px)]">
     <div class="bg-white border-b-2 border-brand-dark p-6 flex justify-between items-center shrink-0">
@@ -607,23 +1178,214 @@ template_dict = {
     'index.html': INDEX_TEMPLATE,
     'dashboard.html': DASHBOARD_TEMPLATE,
     'rows.html': ROWS_TEMPLATE,
+    '_rows_fragment.html': ROWS_FRAGMENT_TEMPLATE,
     'editor.html': EDITOR_TEMPLATE
 }
-app.jinja_loader = DictLoader(template_dict)
-
-@app.template_filter('to_json')
-def to_json_filter(value): return json_util.dumps(value)
+# `flask --app app compile-templates` (run in the Docker build) precompiles template_dict into Python modules.
+# The archive name carries a digest of the sources, so a stale build is never picked up.
+TEMPLATES_DIGEST = hashlib.blake2b(''.join(template_dict[k] for k in sorted(template_dict)).encode(), digest_size=8).hexdigest()
+COMPILED_TEMPLATES = os.path.join(app.root_path, 'compiled_templates', f"templates_{TEMPLATES_DIGEST}.zip")
+app.jinja_loader = ModuleLoader(COMPILED_TEMPLATES) if os.path.exists(COMPILED_TEMPLATES) else DictLoader(template_dict)
+app.jinja_env.globals['ICONS'] = ICONS
+
+def vendored(name): return os.path.exists(os.path.join(VENDOR_DIR, name))
+
+_ASSET_VERSIONS = {}
+
+def asset_url(name):
+    # Local copy when it has been vendored, the pinned CDN URL otherwise. Local URLs carry a digest
+    # of the file, so a rebuilt styles.css or bundle never hides behind an immutable cached copy
+    if not vendored(name): return VENDOR_ASSETS[name]
+    if name not in _ASSET_VERSIONS:
+        with open(os.path.join(VENDOR_DIR, name), 'rb') as f: _ASSET_VERSIONS[name] = hashlib.blake2b(f.read(), digest_size=6).hexdigest()
+    return f"/vendor/{name}?v={_ASSET_VERSIONS[name]}"
+
+app.jinja_env.globals.update(asset=asset_url, vendored=vendored)
+_HEAD_BYTES = app.jinja_env.from_string(HEAD_LAYOUT).render(fonts_url=FONTS_CSS_URL).encode()
+# Compiled template code is shared across workers through the bytecode cache
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache(pattern='l4u_%s.cache')
+# Templates live in this module, so a change restarts the process anyway; skip the per-render
+# up-to-date check even under FLASK_DEBUG (the config key stops Flask's debug setter re-enabling it)
+app.config['TEMPLATES_AUTO_RELOAD'] = False
+app.jinja_env.auto_reload = False
+
+def _json_default(o):
+    # BSON types keep their Extended JSON shape; anything else (Decimal, UUID...) falls back to str
+    try: return json_util.default(o)
+    except TypeError: return str(o)
+
+def dump_json(value, indent=False):
+    """Serializes with orjson, falling back to json_util for values it rejects (e.g. ints over 64 bits)."""
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+    if indent: option |= orjson.OPT_INDENT_2
+    try: return orjson.dumps(value, default=_json_default, option=option)
+    except orjson.JSONEncodeError: return json_util.dumps(value, indent=2 if indent else None).encode()
+
+# Extended JSON wrappers are objects opening with a $-key ({"$oid": ...}); a "$" inside a value doesn't count
+_EXTENDED_JSON = re.compile(r'\{\s*"\$')
+
+def load_json(text):
+    """Parses editor input: orjson for plain JSON, json_util when Extended JSON ($oid, $date...) is present."""
+    if _EXTENDED_JSON.search(text): return json_util.loads(text)
+    return orjson.loads(text)
+
+_SIDEBAR_LINK = '<a href="%s" class="block px-4 py-3 border-2 %s transition-all truncate">%s</a>'
+_SIDEBAR_ACTIVE = 'bg-brand-accent border-brand-dark font-bold shadow-[2px_2px_0_0_#000]'
+_SIDEBAR_IDLE = 'border-transparent hover:border-brand-dark hover:bg-gray-50'
+
+@app.template_global()
+def sidebar_html(dbs):
+    """Sidebar database links, built with a single url_for instead of one per database."""
+    url = url_for('list_tables', db_name='__DB__')
+    current = session.get('current_db_name')
+    return Markup('\n').join(Markup(_SIDEBAR_LINK) % (url.replace('__DB__', quote(db, safe='')), _SIDEBAR_ACTIVE if db == current else _SIDEBAR_IDLE, db) for db in dbs)
+
+@app.template_filter('highlight')
+def highlight_filter(value, needle):
+    """Wraps case-insensitive matches of the search term in <mark>, escaping the text around them."""
+    if not needle: return escape(value)
+    # Repeated cells (IDs, enum-like values) are highlighted once per request
+    cache = g.setdefault('_hl_cache', {})
+    key = (value, needle)
+    if key not in cache: cache[key] = _highlight(value, needle)
+    return cache[key]
+
+def _highlight(value, needle):
+    text = str(value)
+    # Build the pattern once per request; a C-level find() screens out cells that cannot match
+    if getattr(g, '_hl_needle', None) != needle:
+        g._hl_needle = needle
+        g._hl_lower = needle.lower()
+        g._hl_pat = re.compile(f"({re.escape(needle)})", re.IGNORECASE)
+    if text.lower().find(g._hl_lower) == -1: return escape(text)
+    # Match on the raw text and escape piece by piece, so a search never lands inside an entity like &#34;
+    parts = g._hl_pat.split(text)
+    return Markup('').join(Markup('<mark>%s</mark>') % p if i % 2 else escape(p) for i, p in enumerate(parts))
+
+def stream_json(rows):
+    """Emits a JSON array one row at a time so large pages never sit fully in memory."""
+    yield b'['
+    for i, row in enumerate(rows):
+        yield (b',\n' if i else b'\n') + dump_json(row, indent=True)
+    yield b'\n]'
+
+def _gzip_head():
+    # The head is compressed once; each response continues from a copy of this compressor state
+    z = zlib.compressobj(6, zlib.DEFLATED, 31)
+    return z, z.compress(_HEAD_BYTES) + z.flush(zlib.Z_SYNC_FLUSH)
+
+_HEAD_Z, _HEAD_GZ = _gzip_head()
+
+def gzip_stream(chunks, z, prefix=b''):
+    """Gzips a streamed body incrementally, so compression doesn't force buffering the page."""
+    yield prefix
+    for chunk in chunks:
+        data = z.compress(chunk.encode() if isinstance(chunk, str) else chunk)
+        if data: yield data
+    yield z.flush()
+
+def html_response(body, head=True):
+    if 'gzip' in request.accept_encodings:
+        if head: body = gzip_stream(body, _HEAD_Z.copy(), _HEAD_GZ)
+        else: body = gzip_stream(body, zlib.compressobj(6, zlib.DEFLATED, 31))
+    elif head: body = itertools.chain([_HEAD_BYTES], body)
+    resp = Response(stream_with_context(body), mimetype='text/html')
+    if 'gzip' in request.accept_encodings: resp.headers['Content-Encoding'] = 'gzip'
+    resp.vary.add('Accept-Encoding')
+    return resp
+
+def _revalidate(resp, etag):
+    # Private and always revalidated, so the browser never holds a page past a write the server cache has seen
+    resp.set_etag(etag, weak=True)
+    resp.cache_control.private = True
+    resp.cache_control.no_cache = True
+    return resp
+
+def _not_modified(etag):
+    resp = _revalidate(Response(status=304), etag)
+    resp.vary.update(('Accept-Encoding', 'HX-Request'))
+    return resp
+
+def render_page(template, **context):
+    """Streams the static head bytes first, then the Jinja-rendered page body."""
+    # Pop flashes now: the session cookie is written before the body finishes streaming
+    get_flashed_messages(with_categories=True)
+    return html_response(stream_template(template, **context))
 
 # ==========================================
 # ROUTES
 # ==========================================
 
+@app.cli.command('vendor-assets')
+def vendor_assets():
+    """Downloads the pinned front-end assets into static/vendor, then bundles and precompresses them."""
+    os.makedirs(VENDOR_DIR, exist_ok=True)
+    for name, url in VENDOR_ASSETS.items():
+        urlretrieve(url, os.path.join(VENDOR_DIR, name))
+        print(f"{name} <- {url}")
+    _vendor_fonts()
+
+    for bundle, parts in ASSET_BUNDLES.items():
+        if not all(vendored(p) for p in parts): continue
+        sep = b'\n;\n' if bundle.endswith('.js') else b'\n'
+        with open(os.path.join(VENDOR_DIR, bundle), 'wb') as out:
+            for p in parts:
+                with open(os.path.join(VENDOR_DIR, p), 'rb') as f: out.write(f.read() + sep)
+        print(f"{bundle} <- {' + '.join(parts)}")
+
+    # Text assets get a .gz sibling that vendor_asset sends as-is; fonts are already compressed
+    for name in os.listdir(VENDOR_DIR):
+        if not name.endswith(('.css', '.js')): continue
+        path = os.path.join(VENDOR_DIR, name)
+        with open(path, 'rb') as f, gzip.GzipFile(path + '.gz', 'wb', 9, mtime=0) as gz: gz.write(f.read())
+
+def _vendor_fonts():
+    # Google serves woff2 only to browsers it recognises; font files are named after their (versioned) URL
+    css = urlopen(Request(FONTS_CSS_URL, headers={'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 Chrome/120.0 Safari/537.36'})).read().decode()
+    def fetch(m):
+        name = f"font-{hashlib.blake2b(m.group(1).encode(), digest_size=6).hexdigest()}.woff2"
+        urlretrieve(m.group(1), os.path.join(VENDOR_DIR, name))
+        return f"url({name})"
+    with open(os.path.join(VENDOR_DIR, 'fonts.css'), 'w') as f: f.write(re.sub(r'url\((https://fonts\.gstatic\.com/[^)]+)\)', fetch, css))
+    print(f"fonts.css <- {FONTS_CSS_URL}")
+
+@app.cli.command('compile-templates')
+def compile_templates():
+    """Compiles the inline templates into a zip of Python modules for ModuleLoader."""
+    os.makedirs(os.path.dirname(COMPILED_TEMPLATES), exist_ok=True)
+    # Compile from the sources even if an archive is already loaded
+    env = app.jinja_env.overlay(loader=DictLoader(template_dict))
+    env.compile_templates(COMPILED_TEMPLATES, zip='deflated', ignore_errors=False)
+    print(COMPILED_TEMPLATES)
+
+@app.route('/vendor/<path:filename>')
+def vendor_asset(filename):
+    # Asset URLs carry a content digest, so a copy never changes under its URL
+    gz = 'gzip' in request.accept_encodings and os.path.exists(os.path.join(VENDOR_DIR, filename + '.gz'))
+    resp = send_from_directory(VENDOR_DIR, filename + '.gz' if gz else filename, max_age=31536000, mimetype=mimetypes.guess_type(filename)[0])
+    if gz: resp.headers['Content-Encoding'] = 'gzip'
+    resp.vary.add('Accept-Encoding')
+    resp.cache_control.public = True
+    resp.cache_control.immutable = True
+    return resp
+
+_DB_LIST_CACHE = {}
+
+def _db_list_key(): return uri_digest(session['db_uri'])
+
 @app.context_processor
 def inject_dbs():
     if session.get('db_uri'):
+        # Every page renders the sidebar; only go to the server when the cached list has expired
+        key = _db_list_key()
+        hit = _DB_LIST_CACHE.get(key)
+        if hit and time.monotonic() - hit[0] < DB_LIST_CACHE_TTL: return {'dbs': hit[1]}
         try:
             adp = get_adapter()
-            if adp: return {'dbs': adp.list_databases()}
+            if adp:
+                dbs = adp.list_databases()
+                _DB_LIST_CACHE[key] = (time.monotonic(), dbs)
+                return {'dbs': dbs}
         except: pass
     return {'dbs': []}
 
@@ -631,7 +1393,9 @@ def inject_dbs():
 def index():
     if session.get('db_uri'): 
         return redirect(url_for('list_tables', db_name=session.get('current_db_name', 'default')))
-    return render_template('index.html')
+    # Pending flash messages (e.g. a failed connect) are the only thing that varies on the landing page
+    if '_flashes' in session: return render_page('index.html')
+    return static_page_response(*_LOGIN_PAGE)
 
 @app.route('/connect', methods=['POST'])
 def connect_db():
@@ -640,6 +1404,7 @@ def connect_db():
     adp = get_adapter()
     if adp:
         dbs = adp.list_databases()
+        _DB_LIST_CACHE[_db_list_key()] = (time.monotonic(), dbs)
         default_db = dbs[0] if dbs else 'default'
         return redirect(url_for('list_tables', db_name=default_db))
     session.pop('db_uri', None)
@@ -658,7 +1423,9 @@ def list_tables(db_name):
     if not adp: return redirect(url_for('logout'))
     try:
         tables = adp.list_tables(db_name)
-        return render_template('dashboard.html', db_name=db_name, tables=tables)
+        # The table the user clicks next is likely among the first few; have its page ready
+        warm_rows(adp, uri_digest(session['db_uri']), db_name, tables)
+        return render_page('dashboard.html', db_name=db_name, tables=tables)
     except Exception as e:
         flash(str(e), 'error')
         return redirect(url_for('index'))
@@ -667,7 +1434,11 @@ def list_tables(db_name):
 def drop_database_route(db_name):
     adp = get_adapter()
     try:
+        # This worker's pool on the database goes first: Postgres refuses to drop a database with open connections
+        forget_adapter(db_name)
         adp.drop_database(db_name)
+        _DB_LIST_CACHE.pop(_db_list_key(), None)
+        forget_rows(uri_digest(session['db_uri']), db_name)
         flash(f"Database {db_name} deleted.", 'success')
         return redirect(url_for('index'))
     except Exception as e:
@@ -677,13 +1448,41 @@ def drop_database_route(db_name):
 @app.route('/dashboard/<db_name>/<table>')
 def view_rows(db_name, table):
     adp = get_adapter(db_name)
-    page = int(request.args.get('page', 1))
+    page = max(1, request.args.get('page', 1, type=int))
     search = request.args.get('q', None)
     sort_col = request.args.get('sort', None)
     sort_dir = request.args.get('dir', 'desc')
     try:
-        rows, total = adp.get_rows(db_name, table, page, search, sort_col, sort_dir)
-        return render_template('rows.html', db_name=db_name, table=table, rows=rows, total=total, page=page, sort_col=sort_col, sort_dir=sort_dir)
+        after = request.args.get('after') if page > 1 and adp.supports_after(sort_col) else None
+        # Clicking back and forth through pages is served from a short-lived cache, invalidated on writes
+        key = rows_key(uri_digest(session['db_uri']), db_name, table, page, search, sort_col, sort_dir, after)
+        rows, total, version = cached_rows(key, lambda: adp.get_rows(db_name, table, page, search, sort_col, sort_dir, after, adp.preview_fields(db_name, table)))
+        last_page = max(1, math.ceil(total / ROWS_PER_PAGE))
+        if page > last_page:
+            return redirect(url_for('view_rows', db_name=db_name, table=table, q=search or None, sort=sort_col, dir=sort_dir, page=last_page))
+        # Query-string state and the pager/sort links are resolved once here rather than per use in the template
+        link = dict(db_name=db_name, table=table, q=search or None, sort=sort_col, dir=sort_dir)
+        nav = SimpleNamespace(
+            q=search or '', sort=sort_col or '', dir=sort_dir, keyset=adp.supports_after(sort_col),
+            prev_url=url_for('view_rows', **link, page=page - 1),
+            next_url=url_for('view_rows', **link, page=page + 1),
+            sort_url=url_for('view_rows', **dict(link, sort='id', dir='desc' if sort_dir == 'asc' else 'asc'), page=page),
+        )
+        # Rows are rendered as the adapter yields them instead of being collected first
+        fragment = bool(request.headers.get('HX-Request')) and not request.headers.get('HX-History-Restore-Request')
+        # A page built from cached rows is identified by that cache entry, so a revisit can be answered with a 304.
+        # Not while flashes are pending: they are only shown by a full render
+        etag = None
+        if version is not None and not session.get('_flashes'):
+            etag = hashlib.blake2b(repr((key, version, fragment, TEMPLATES_DIGEST)).encode(), digest_size=8).hexdigest()
+            if request.if_none_match.contains_weak(etag): return _not_modified(etag)
+
+        ctx = dict(db_name=db_name, table=table, rows=prime(rows), total=total, page=page, sort_col=sort_col, sort_dir=sort_dir, nav=nav)
+        # Sort/pagination clicks only need the table and pager, not the whole page
+        resp = html_response(stream_template('_rows_fragment.html', **ctx), head=False) if fragment else render_page('rows.html', **ctx)
+        resp.vary.add('HX-Request')
+        if etag: _revalidate(resp, etag)
+        return resp
     except Exception as e:
         flash(str(e), 'error')
         return redirect(url_for('list_tables', db_name=db_name))
@@ -695,12 +1494,10 @@ def view_raw_table(db_name, table):
     Like GitHub 'Raw' view.
     """
     adp = get_adapter(db_name)
-    page = int(request.args.get('page', 1))
+    page = max(1, request.args.get('page', 1, type=int))
     try:
-        rows, total = adp.get_rows(db_name, table, page)
-        # Clean rows for raw output (remove __id helper if needed, or keep it)
-        json_str = json_util.dumps(rows, indent=2)
-        return Response(json_str, mimetype='text/plain')
+        rows = prime(adp.iter_rows(db_name, table, page))
+        return Response(stream_with_context(stream_json(rows)), mimetype='text/plain')
     except Exception as e:
         return Response(f"Error: {str(e)}", mimetype='text/plain', status=500)
 
@@ -714,8 +1511,7 @@ def view_raw_row(db_name, table, id):
         row = adp.get_row(db_name, table, id)
         if not row:
             return Response("Not Found", mimetype='text/plain', status=404)
-        json_str = json_util.dumps(row, indent=2)
-        return Response(json_str, mimetype='text/plain')
+        return Response(dump_json(row, indent=True), mimetype='text/plain')
     except Exception as e:
         return Response(f"Error: {str(e)}", mimetype='text/plain', status=500)
 
@@ -724,9 +1520,17 @@ def edit_row(db_name, table, id):
     adp = get_adapter(db_name)
     if request.method == 'POST':
         try:
-            data = json.loads(request.form['json_data'])
-            adp.save_row(db_name, table, id, data, is_new=(id=='new'))
-            flash('Record Saved', 'success')
+            data = load_json(request.form['json_data'])
+            if id == 'new' and isinstance(data, list):
+                # Checked up front: [] would be an INSERT DEFAULT VALUES on SQL and a TypeError from insert_many
+                if not data or not all(isinstance(row, dict) for row in data):
+                    raise ValueError('expected a non-empty list of objects')
+                adp.add_rows(db_name, table, data)
+                flash(f'{len(data)} Records Saved', 'success')
+            else:
+                adp.save_row(db_name, table, id, data, is_new=(id=='new'))
+                flash('Record Saved', 'success')
+            forget_rows(uri_digest(session['db_uri']), db_name, table)
             return redirect(url_for('view_rows', db_name=db_name, table=table))
         except Exception as e:
             flash(f"Save Error: {str(e)}", 'error')
@@ -734,18 +1538,42 @@ def edit_row(db_name, table, id):
     data_str = "{\n\n}"
     if id != 'new':
         row = adp.get_row(db_name, table, id)
-        if row: data_str = json_util.dumps(row, indent=2)
-    return render_template('editor.html', db_name=db_name, table=table, id=id, data=data_str)
+        if row: data_str = dump_json(row, indent=True).decode()
+    return render_page('editor.html', db_name=db_name, table=table, id=id, data=data_str)
 
 @app.route('/dashboard/<db_name>/<table>/<id>/delete', methods=['POST'])
 def delete_row(db_name, table, id):
     adp = get_adapter(db_name)
     try:
         adp.delete_row(db_name, table, id)
+        forget_rows(uri_digest(session['db_uri']), db_name, table)
         flash('Record Deleted', 'success')
     except Exception as e:
         flash(str(e), 'error')
     return redirect(url_for('view_rows', db_name=db_name, table=table))
 
+def _static_page(template):
+    """Renders a page that has no per-request content once, with its gzip body and ETag."""
+    with app.test_request_context():
+        body = _HEAD_BYTES + render_template(template).encode()
+    z = zlib.compressobj(9, zlib.DEFLATED, 31)
+    return body, z.compress(body) + z.flush(), hashlib.blake2b(body, digest_size=8).hexdigest()
+
+def static_page_response(body, body_gz, etag):
+    gz = 'gzip' in request.accept_encodings
+    resp = Response(body_gz if gz else body, mimetype='text/html')
+    if gz: resp.headers['Content-Encoding'] = 'gzip'
+    resp.vary.add('Accept-Encoding')
+    resp.set_etag(f"{etag}-gz" if gz else etag)
+    # Always revalidate (the same URL redirects once connected), but a matching ETag gets a bodyless 304
+    resp.cache_control.no_cache = True
+    return resp.make_conditional(request)
+
+# Every template is parsed once here at import instead of on the first request each worker serves.
+# This has to run after the filters and globals above are registered: Jinja resolves filters at compile time
+for name in template_dict: app.jinja_env.get_template(name)
+_LOGIN_PAGE = _static_page('index.html')
+
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=int(os.environ.get('PORT', 8080)), debug=True)
+    # Debugger/reloader only on request; the threaded server keeps a slow DB call from stalling every other request
+    app.run(host='0.0.0.0', port=int(os.environ.get('PORT', 8080)), debug=os.environ.get('FLASK_DEBUG') == '1', threaded=True)
@@ -0,0 +1,19 @@
+/** @type {import('tailwindcss').Config} */
+module.exports = {
+  // Templates are inline strings in app.py
+  content: ['./app.py'],
+  theme: {
+    extend: {
+      fontFamily: { sans: ['"DM Sans"', 'sans-serif'], serif: ['"Playfair Display"', 'serif'] },
+      colors: {
+        brand: {
+          bg: '#FDFBF7',
+          border: '#1C1917',
+          accent: '#86EFAC', // Green
+          dark: '#1C1917'
+        }
+      },
+      boxShadow: { 'hard': '4px 4px 0px 0px #1C1917' }
+    }
+  }
+}